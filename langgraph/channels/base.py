@@ -71,6 +71,15 @@ class BaseChannel(Generic[Value, Update, C], ABC):
 
         Raises EmptyChannelError if the channel is empty (never updated yet)."""
 
+    def is_available(self) -> bool:
+        """Return True if the channel has a value, ie. get() won't raise
+        EmptyChannelError. Subclasses should override this with a cheaper check."""
+        try:
+            self.get()
+            return True
+        except EmptyChannelError:
+            return False
+
     @abstractmethod
     def checkpoint(self) -> Optional[C]:
         """Return a string representation of the channel's current state.
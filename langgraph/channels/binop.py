@@ -63,6 +63,9 @@ class BinaryOperatorAggregate(Generic[Value], BaseChannel[Value, Value, Value]):
         except AttributeError:
             raise EmptyChannelError()
 
+    def is_available(self) -> bool:
+        return hasattr(self, "value")
+
     def checkpoint(self) -> Value:
         try:
             return self.value
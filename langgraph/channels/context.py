@@ -106,5 +106,8 @@ class Context(Generic[Value], BaseChannel[Value, None, None]):
         except AttributeError:
             raise EmptyChannelError()
 
+    def is_available(self) -> bool:
+        return hasattr(self, "value")
+
     def checkpoint(self) -> None:
         raise EmptyChannelError()
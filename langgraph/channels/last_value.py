@@ -54,6 +54,9 @@ class LastValue(Generic[Value], BaseChannel[Value, Value, Value]):
         except AttributeError:
             raise EmptyChannelError()
 
+    def is_available(self) -> bool:
+        return hasattr(self, "value")
+
     def checkpoint(self) -> Value:
         try:
             return self.value
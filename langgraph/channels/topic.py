@@ -77,5 +77,8 @@ class Topic(
     def get(self) -> Sequence[Value]:
         return list(self.values)
 
+    def is_available(self) -> bool:
+        return True
+
     def checkpoint(self) -> tuple[set[Value], list[Value]]:
         return (self.seen, self.values)
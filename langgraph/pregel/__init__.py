@@ -2,15 +2,18 @@ from __future__ import annotations
 
 import asyncio
 import concurrent.futures
-from collections import defaultdict, deque
+from collections import deque
+from contextvars import copy_context
 from functools import partial
 from typing import (
     Any,
     AsyncIterator,
     Awaitable,
     Callable,
+    Iterable,
     Iterator,
     Mapping,
+    NamedTuple,
     Optional,
     Sequence,
     Type,
@@ -73,6 +76,9 @@ WriteValue = Union[
 ]
 
 
+RESERVED_CHANNELS = frozenset(c.value for c in ReservedChannels)
+
+
 class GraphRecursionError(RecursionError):
     pass
 
@@ -268,9 +274,13 @@ class Pregel(
                 input_keys = self.input
             else:
                 validate_keys(input_keys, self.channels)
+            # input channels as a set, for O(1) lookups when mapping input
+            input_channels = (
+                input_keys if isinstance(input_keys, str) else frozenset(input_keys)
+            )
             interrupt = interrupt or self.interrupt
-            # copy nodes to ignore mutations during execution
-            processes = {**self.nodes}
+            # snapshot nodes to ignore mutations during execution
+            processes = _plan_processes(self.nodes)
             # get checkpoint from saver, or create an empty one
             checkpoint = self.checkpointer.get(config) if self.checkpointer else None
             checkpoint = checkpoint or empty_checkpoint()
@@ -279,9 +289,9 @@ class Pregel(
                 self.channels, checkpoint
             ) as channels, get_executor_for_config(config) as executor:
                 # map inputs to channel updates
-                if input_writes := deque(
-                    w for c in input for w in map_input(input_keys, c)
-                ):
+                if input_writes := [
+                    w for c in input for w in map_input(input_channels, c)
+                ]:
                     # discard any unfinished tasks from previous checkpoint
                     _prepare_next_tasks(checkpoint, processes, channels)
                     # apply input writes
@@ -295,13 +305,27 @@ class Pregel(
 
                 read = partial(_read_channel, channels)
 
+                # collect all writes to channels, without applying them yet
+                # the same deque is reused across steps
+                pending_writes = deque[tuple[str, Any]]()
+                # channels written to by tasks in the previous step, if any
+                updated_channels: Optional[set[str]] = None
+                # reserved channels are updated every step, even without writes
+                reserved_triggers = _has_reserved_triggers(processes)
+
                 # Similarly to Bulk Synchronous Parallel / Pregel model
                 # computation proceeds in steps, while there are channel updates
                 # channel updates from step N are only visible in step N+1
                 # channels are guaranteed to be immutable for the duration of the step,
                 # with channel updates applied only at the transition between steps
                 for step in range(config["recursion_limit"] + 1):
-                    next_tasks = _prepare_next_tasks(checkpoint, processes, channels)
+                    next_tasks = _prepare_next_tasks_if_updated(
+                        checkpoint,
+                        processes,
+                        channels,
+                        updated_channels,
+                        reserved_triggers,
+                    )
 
                     # if no more tasks, we're done
                     if not next_tasks:
@@ -316,46 +340,50 @@ class Pregel(
                     if self.debug:
                         print_step_start(step, next_tasks)
 
-                    # collect all writes to channels, without applying them yet
-                    pending_writes = deque[tuple[str, Any]]()
+                    # discard writes from the previous step
+                    pending_writes.clear()
 
-                    # prepare tasks with config
-                    tasks_w_config = [
-                        (
-                            proc,
-                            input,
-                            patch_config(
-                                config,
-                                run_name=name,
-                                callbacks=run_manager.get_child(f"graph:step:{step}"),
-                                configurable={
-                                    # deque.extend is thread-safe
-                                    CONFIG_KEY_SEND: pending_writes.extend,
-                                    CONFIG_KEY_READ: read,
-                                },
-                            ),
-                        )
-                        for proc, input, name in next_tasks
-                    ]
+                    # callbacks and configurable are shared by all tasks in a step
+                    step_config = patch_config(
+                        config,
+                        callbacks=run_manager.get_child(f"graph:step:{step}"),
+                        configurable={
+                            # deque.extend is thread-safe
+                            CONFIG_KEY_SEND: pending_writes.extend,
+                            CONFIG_KEY_READ: read,
+                        },
+                    )
 
-                    futures = [
-                        executor.submit(proc.invoke, input, config)
-                        for proc, input, config in tasks_w_config
-                    ]
+                    if len(next_tasks) == 1 and self.step_timeout is None:
+                        # run a single task in-line, skipping the executor
+                        proc, val, name = next_tasks[0]
+                        copy_context().run(
+                            proc.invoke, val, patch_config(step_config, run_name=name)
+                        )
+                    else:
+                        # submit tasks with config, in a single pass
+                        futures = [
+                            executor.submit(
+                                proc.invoke,
+                                input,
+                                patch_config(step_config, run_name=name),
+                            )
+                            for proc, input, name in next_tasks
+                        ]
 
-                    # execute tasks, and wait for one to fail or all to finish.
-                    # each task is independent from all other concurrent tasks
-                    done, inflight = concurrent.futures.wait(
-                        futures,
-                        return_when=concurrent.futures.FIRST_EXCEPTION,
-                        timeout=self.step_timeout,
-                    )
+                        # execute tasks, and wait for one to fail or all to finish.
+                        # each task is independent from all other concurrent tasks
+                        done, inflight = concurrent.futures.wait(
+                            futures,
+                            return_when=concurrent.futures.FIRST_EXCEPTION,
+                            timeout=self.step_timeout,
+                        )
 
-                    # interrupt on failure or timeout
-                    _interrupt_or_proceed(done, inflight, step)
+                        # interrupt on failure or timeout
+                        _interrupt_or_proceed(done, inflight, step)
 
                     # apply writes to channels
-                    _apply_writes(
+                    updated_channels = _apply_writes(
                         checkpoint, channels, pending_writes, config, step + 1
                     )
 
@@ -363,7 +391,9 @@ class Pregel(
                         print_checkpoint(step, channels)
 
                     # yield current value and checkpoint view
-                    if step_output := map_output(output_keys, pending_writes, channels):
+                    if step_output := map_output(
+                        output_keys, updated_channels, channels
+                    ):
                         yield step_output
                         # we can detect updates when output is multiple channels (ie. dict)
                         if not isinstance(output_keys, str):
@@ -379,7 +409,7 @@ class Pregel(
                         self.checkpointer.put(config, checkpoint)
 
                     # interrupt if any channel written to is in interrupt list
-                    if any(chan for chan, _ in pending_writes if chan in interrupt):
+                    if not updated_channels.isdisjoint(interrupt):
                         break
 
                 # save end of run checkpoint
@@ -430,9 +460,13 @@ class Pregel(
                 input_keys = self.input
             else:
                 validate_keys(input_keys, self.channels)
+            # input channels as a set, for O(1) lookups when mapping input
+            input_channels = (
+                input_keys if isinstance(input_keys, str) else frozenset(input_keys)
+            )
             interrupt = interrupt or self.interrupt
-            # copy nodes to ignore mutations during execution
-            processes = {**self.nodes}
+            # snapshot nodes to ignore mutations during execution
+            processes = _plan_processes(self.nodes)
             # get checkpoint from saver, or create an empty one
             checkpoint = (
                 await self.checkpointer.aget(config) if self.checkpointer else None
@@ -441,9 +475,9 @@ class Pregel(
             # create channels from checkpoint
             async with AsyncChannelsManager(self.channels, checkpoint) as channels:
                 # map inputs to channel updates
-                if input_writes := deque(
-                    [w async for c in input for w in map_input(input_keys, c)]
-                ):
+                if input_writes := [
+                    w async for c in input for w in map_input(input_channels, c)
+                ]:
                     # discard any unfinished tasks from previous checkpoint
                     _prepare_next_tasks(checkpoint, processes, channels)
                     # apply input writes
@@ -457,13 +491,27 @@ class Pregel(
 
                 read = partial(_read_channel, channels)
 
+                # collect all writes to channels, without applying them yet
+                # the same deque is reused across steps
+                pending_writes = deque[tuple[str, Any]]()
+                # channels written to by tasks in the previous step, if any
+                updated_channels: Optional[set[str]] = None
+                # reserved channels are updated every step, even without writes
+                reserved_triggers = _has_reserved_triggers(processes)
+
                 # Similarly to Bulk Synchronous Parallel / Pregel model
                 # computation proceeds in steps, while there are channel updates
                 # channel updates from step N are only visible in step N+1,
                 # channels are guaranteed to be immutable for the duration of the step,
                 # channel updates being applied only at the transition between steps
                 for step in range(config["recursion_limit"] + 1):
-                    next_tasks = _prepare_next_tasks(checkpoint, processes, channels)
+                    next_tasks = _prepare_next_tasks_if_updated(
+                        checkpoint,
+                        processes,
+                        channels,
+                        updated_channels,
+                        reserved_triggers,
+                    )
 
                     # if no more tasks, we're done
                     if not next_tasks:
@@ -478,53 +526,77 @@ class Pregel(
                     if self.debug:
                         print_step_start(step, next_tasks)
 
-                    # collect all writes to channels, without applying them yet
-                    pending_writes = deque[tuple[str, Any]]()
+                    # discard writes from the previous step
+                    pending_writes.clear()
+
+                    # callbacks and configurable are shared by all tasks in a step
+                    step_config = patch_config(
+                        config,
+                        callbacks=run_manager.get_child(f"graph:step:{step}"),
+                        configurable={
+                            # deque.extend is thread-safe
+                            CONFIG_KEY_SEND: pending_writes.extend,
+                            CONFIG_KEY_READ: read,
+                        },
+                    )
 
                     # prepare tasks with config
                     tasks_w_config = [
-                        (
-                            proc,
-                            input,
-                            patch_config(
-                                config,
-                                run_name=name,
-                                callbacks=run_manager.get_child(f"graph:step:{step}"),
-                                configurable={
-                                    # deque.extend is thread-safe
-                                    CONFIG_KEY_SEND: pending_writes.extend,
-                                    CONFIG_KEY_READ: read,
-                                },
-                            ),
-                        )
+                        (proc, input, patch_config(step_config, run_name=name))
                         for proc, input, name in next_tasks
                     ]
 
-                    futures = (
-                        [
-                            asyncio.create_task(_aconsume(proc.astream(input, config)))
-                            for proc, input, config in tasks_w_config
-                        ]
-                        if do_stream
-                        else [
-                            asyncio.create_task(proc.ainvoke(input, config))
-                            for proc, input, config in tasks_w_config
-                        ]
-                    )
-
-                    # execute tasks, and wait for one to fail or all to finish.
-                    # each task is independent from all other concurrent tasks
-                    done, inflight = await asyncio.wait(
-                        futures,
-                        return_when=asyncio.FIRST_EXCEPTION,
-                        timeout=self.step_timeout,
-                    )
+                    if len(tasks_w_config) == 1 and self.step_timeout is None:
+                        # run a single task in-line, skipping task scheduling
+                        proc, val, task_config = tasks_w_config[0]
+                        if do_stream:
+                            await _aconsume(proc.astream(val, task_config))
+                        else:
+                            await proc.ainvoke(val, task_config)
+                    else:
+                        futures = (
+                            [
+                                asyncio.create_task(
+                                    _aconsume(proc.astream(input, config))
+                                )
+                                for proc, input, config in tasks_w_config
+                            ]
+                            if do_stream
+                            else [
+                                asyncio.create_task(proc.ainvoke(input, config))
+                                for proc, input, config in tasks_w_config
+                            ]
+                        )
 
-                    # interrupt on failure or timeout
-                    _interrupt_or_proceed(done, inflight, step)
+                        # execute tasks, and wait for one to fail or all to finish.
+                        # each task is independent from all other concurrent tasks
+                        if self.step_timeout is None:
+                            try:
+                                await asyncio.gather(*futures)
+                            except BaseException:
+                                # cancel all pending tasks
+                                for fut in futures:
+                                    fut.cancel()
+                                # let cancelled tasks finish unwinding before raising
+                                await asyncio.gather(*futures, return_exceptions=True)
+                                raise
+                        else:
+                            done, inflight = await asyncio.wait(
+                                futures,
+                                return_when=asyncio.FIRST_EXCEPTION,
+                                timeout=self.step_timeout,
+                            )
+
+                            # interrupt on failure or timeout
+                            try:
+                                _interrupt_or_proceed(done, inflight, step)
+                            except BaseException:
+                                # let cancelled tasks finish unwinding before raising
+                                await asyncio.gather(*inflight, return_exceptions=True)
+                                raise
 
                     # apply writes to channels
-                    _apply_writes(
+                    updated_channels = _apply_writes(
                         checkpoint, channels, pending_writes, config, step + 1
                     )
 
@@ -532,7 +604,9 @@ class Pregel(
                         print_checkpoint(step, channels)
 
                     # yield current value and checkpoint view
-                    if step_output := map_output(output_keys, pending_writes, channels):
+                    if step_output := map_output(
+                        output_keys, updated_channels, channels
+                    ):
                         yield step_output
                         # we can detect updates when output is multiple channels (ie. dict)
                         if not isinstance(output_keys, str):
@@ -548,7 +622,7 @@ class Pregel(
                         await self.checkpointer.aput(config, checkpoint)
 
                     # interrupt if any channel written to is in interrupt list
-                    if any(chan for chan, _ in pending_writes if chan in interrupt):
+                    if not updated_channels.isdisjoint(interrupt):
                         break
 
                 # save end of run checkpoint
@@ -688,21 +762,21 @@ def _interrupt_or_proceed(
     inflight: Union[set[concurrent.futures.Future[Any]], set[asyncio.Task[Any]]],
     step: int,
 ) -> None:
-    while done:
-        # if any task failed
-        if exc := done.pop().exception():
+    for task in done:
+        # if any task failed, stop at the first exception
+        if exc := task.exception():
             # cancel all pending tasks
-            while inflight:
-                inflight.pop().cancel()
+            for fut in inflight:
+                fut.cancel()
             # raise the exception
             raise exc
             # TODO this is where retry of an entire step would happen
 
     if inflight:
         # if we got here means we timed out
-        while inflight:
+        for fut in inflight:
             # cancel all pending tasks
-            inflight.pop().cancel()
+            fut.cancel()
         # raise timeout error
         raise TimeoutError(f"Timed out at step {step}")
 
@@ -722,40 +796,45 @@ def _read_channel(
 def _apply_writes(
     checkpoint: Checkpoint,
     channels: Mapping[str, BaseChannel],
-    pending_writes: Sequence[tuple[str, Any]],
+    pending_writes: Iterable[tuple[str, Any]],
     config: RunnableConfig,
     for_step: int,
-) -> None:
-    pending_writes_by_channel: dict[str, list[Any]] = defaultdict(list)
-    # Group writes by channel
+) -> set[str]:
+    """Apply pending writes to channels, returning the names of the channels
+    written to."""
+    pending_writes_by_channel: dict[str, list[Any]] = {}
+    skipped_channels: set[str] = set()
+    # Group writes by channel, in a single pass
     for chan, val in pending_writes:
-        if chan in [c.value for c in ReservedChannels]:
+        if chan in RESERVED_CHANNELS:
             raise ValueError(f"Can't write to reserved channel {chan}")
-        pending_writes_by_channel[chan].append(val)
+        if chan in pending_writes_by_channel:
+            pending_writes_by_channel[chan].append(val)
+        elif chan in channels:
+            pending_writes_by_channel[chan] = [val]
+        elif chan not in skipped_channels:
+            skipped_channels.add(chan)
+            logger.warning(f"Skipping write for channel {chan} which has no readers")
 
     # Update reserved channels
     pending_writes_by_channel[ReservedChannels.is_last_step] = [
         for_step + 1 == config["recursion_limit"]
     ]
 
-    updated_channels: set[str] = set()
     # Apply writes to channels
+    channel_versions = checkpoint["channel_versions"]
     for chan, vals in pending_writes_by_channel.items():
-        if chan in channels:
-            try:
-                channels[chan].update(vals)
-            except InvalidUpdateError as e:
-                raise InvalidUpdateError(
-                    f"Invalid update for channel {chan}: {e}"
-                ) from e
-            checkpoint["channel_versions"][chan] += 1
-            updated_channels.add(chan)
-        else:
-            logger.warning(f"Skipping write for channel {chan} which has no readers")
+        try:
+            channels[chan].update(vals)
+        except InvalidUpdateError as e:
+            raise InvalidUpdateError(f"Invalid update for channel {chan}: {e}") from e
+        channel_versions[chan] += 1
+
     # Channels that weren't updated in this step are notified of a new step
-    for chan in channels:
-        if chan not in updated_channels:
-            channels[chan].update([])
+    for chan in channels.keys() - pending_writes_by_channel.keys():
+        channels[chan].update([])
+
+    return pending_writes_by_channel.keys() - RESERVED_CHANNELS
 
 
 def _apply_writes_from_view(
@@ -773,60 +852,112 @@ def _apply_writes_from_view(
         channels[chan].update([values[chan]])
 
 
+class _ProcessSpec(NamedTuple):
+    """A process, along with the attributes read on every step, precomputed
+    once per run."""
+
+    name: str
+    proc: Union[ChannelInvoke, ChannelBatch]
+    triggers: frozenset[str]
+    reads: tuple[tuple[Optional[str], str], ...]
+    """Pairs of (key, channel) read by the process, empty for batch processes."""
+    is_batch: bool
+    is_keyless: bool
+    """True for processes that subscribe to a single keyless channel."""
+
+
+def _plan_processes(
+    processes: Mapping[str, Union[ChannelInvoke, ChannelBatch]],
+) -> list[_ProcessSpec]:
+    specs: list[_ProcessSpec] = []
+    for name, proc in processes.items():
+        if isinstance(proc, ChannelInvoke):
+            specs.append(
+                _ProcessSpec(
+                    name,
+                    proc,
+                    frozenset(proc.triggers),
+                    tuple(proc.channels.items()),
+                    False,
+                    tuple(proc.channels.keys()) == (None,),
+                )
+            )
+        elif isinstance(proc, ChannelBatch):
+            specs.append(
+                _ProcessSpec(name, proc, frozenset((proc.channel,)), (), True, False)
+            )
+    return specs
+
+
+def _has_reserved_triggers(processes: Sequence[_ProcessSpec]) -> bool:
+    return any(not p.triggers.isdisjoint(RESERVED_CHANNELS) for p in processes)
+
+
+def _prepare_next_tasks_if_updated(
+    checkpoint: Checkpoint,
+    processes: Sequence[_ProcessSpec],
+    channels: Mapping[str, BaseChannel],
+    updated_channels: Optional[set[str]],
+    reserved_triggers: bool,
+) -> list[tuple[Runnable, Any, str]]:
+    # if the previous step wrote nothing, no process can be triggered,
+    # unless some process is triggered by a reserved channel
+    if updated_channels is None or updated_channels or reserved_triggers:
+        return _prepare_next_tasks(checkpoint, processes, channels)
+    else:
+        return []
+
+
 def _prepare_next_tasks(
     checkpoint: Checkpoint,
-    processes: Mapping[str, Union[ChannelInvoke, ChannelBatch]],
+    processes: Sequence[_ProcessSpec],
     channels: Mapping[str, BaseChannel],
 ) -> list[tuple[Runnable, Any, str]]:
     tasks: list[tuple[Runnable, Any, str]] = []
+    channel_versions = checkpoint["channel_versions"]
+    versions_seen = checkpoint["versions_seen"]
     # Check if any processes should be run in next step
     # If so, prepare the values to be passed to them
-    for name, proc in processes.items():
-        seen = checkpoint["versions_seen"][name]
-        if isinstance(proc, ChannelInvoke):
-            # If any of the channels read by this process were updated
-            if any(
-                checkpoint["channel_versions"][chan] > seen[chan]
-                for chan in proc.triggers
-            ):
-                # If all channels subscribed by this process have been initialized
-                try:
-                    val: Any = {
-                        k: _read_channel(
-                            channels, chan, catch=chan not in proc.triggers
-                        )
-                        for k, chan in proc.channels.items()
-                    }
-                except EmptyChannelError:
-                    continue
+    for name, proc, triggers, reads, is_batch, is_keyless in processes:
+        seen = versions_seen[name]
+        # If none of the channels read by this process were updated, skip it
+        if not any(channel_versions[chan] > seen[chan] for chan in triggers):
+            continue
 
+        if is_batch:
+            batch = cast(ChannelBatch, proc)
+            # Here we don't catch EmptyChannelError because the channel
+            # must be intialized if the previous `if` condition is true
+            val: Any = channels[batch.channel].get()
+            if batch.key is not None:
+                val = [{batch.key: v} for v in val]
+
+            tasks.append((batch, val, name))
+            seen[batch.channel] = channel_versions[batch.channel]
+        else:
+            invoke = cast(ChannelInvoke, proc)
+            # If all channels subscribed by this process have been initialized
+            try:
                 # Processes that subscribe to a single keyless channel get
                 # the value directly, instead of a dict
-                if list(proc.channels.keys()) == [None]:
-                    val = val[None]
-
-                # update seen versions
-                seen.update(
-                    {
-                        chan: checkpoint["channel_versions"][chan]
-                        for chan in proc.triggers
+                if is_keyless:
+                    val = _read_channel(
+                        channels, reads[0][1], catch=reads[0][1] not in triggers
+                    )
+                else:
+                    val = {
+                        k: _read_channel(channels, chan, catch=chan not in triggers)
+                        for k, chan in reads
                     }
-                )
+            except EmptyChannelError:
+                continue
 
-                # skip if condition is not met
-                if proc.when is None or proc.when(val):
-                    tasks.append((proc, val, name))
-        elif isinstance(proc, ChannelBatch):
-            # If the channel read by this process was updated
-            if checkpoint["channel_versions"][proc.channel] > seen[proc.channel]:
-                # Here we don't catch EmptyChannelError because the channel
-                # must be intialized if the previous `if` condition is true
-                val = channels[proc.channel].get()
-                if proc.key is not None:
-                    val = [{proc.key: v} for v in val]
-
-                tasks.append((proc, val, name))
-                seen[proc.channel] = checkpoint["channel_versions"][proc.channel]
+            # update seen versions
+            seen.update({chan: channel_versions[chan] for chan in triggers})
+
+            # skip if condition is not met
+            if invoke.when is None or invoke.when(val):
+                tasks.append((invoke, val, name))
 
     return tasks
 
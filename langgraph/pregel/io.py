@@ -1,11 +1,11 @@
-from typing import Any, Iterator, Mapping, Optional, Sequence, Union
+from typing import Any, Collection, Iterator, Mapping, Optional, Sequence, Union
 
 from langgraph.channels.base import BaseChannel
 from langgraph.pregel.log import logger
 
 
 def map_input(
-    input_channels: Union[str, Sequence[str]],
+    input_channels: Union[str, Collection[str]],
     chunk: Optional[Union[dict[str, Any], Any]],
 ) -> Iterator[tuple[str, Any]]:
     """Map input chunk to a sequence of pending writes in the form (channel, value)."""
@@ -20,19 +20,21 @@ def map_input(
             if k in input_channels:
                 yield (k, chunk[k])
             else:
-                logger.warning(f"Input channel {k} not found in {input_channels}")
+                logger.warning(
+                    f"Input channel {k} not found in {sorted(input_channels)}"
+                )
 
 
 def map_output(
     output_channels: Union[str, Sequence[str]],
-    pending_writes: Sequence[tuple[str, Any]],
+    updated_channels: set[str],
     channels: Mapping[str, BaseChannel],
 ) -> Optional[Union[dict[str, Any], Any]]:
-    """Map pending writes (a sequence of tuples (channel, value)) to output chunk."""
+    """Map the set of channels updated in a step to output chunk."""
     if isinstance(output_channels, str):
-        if any(chan == output_channels for chan, _ in pending_writes):
+        if output_channels in updated_channels:
             return channels[output_channels].get()
     else:
-        if updated := {c for c, _ in pending_writes if c in output_channels}:
+        if updated := updated_channels.intersection(output_channels):
             return {chan: channels[chan].get() for chan in updated}
     return None
@@ -52,17 +52,13 @@ class ChannelWrite(RunnablePassthrough):
         ]
 
     def _write(self, input: Any, config: RunnableConfig) -> None:
-        values = [
-            (chan, r.invoke(input, config) if r else input)
-            for chan, r, _ in self.channels
-        ]
-        values = [
-            write
-            for write, (_, _, skip_none) in zip(values, self.channels)
-            if not skip_none or write[1] is not None
-        ]
+        values: dict[str, Any] = {}
+        for chan, r, skip_none in self.channels:
+            val = r.invoke(input, config) if r else input
+            if not skip_none or val is not None:
+                values[chan] = val
 
-        self.do_write(config, **dict(values))
+        self.do_write(config, **values)
 
     async def _awrite(self, input: Any, config: RunnableConfig) -> None:
         values = await asyncio.gather(
@@ -71,13 +67,14 @@ class ChannelWrite(RunnablePassthrough):
                 for _, r, _ in self.channels
             )
         )
-        values = [
-            (chan, val)
-            for val, (chan, _, skip_none) in zip(values, self.channels)
-            if not skip_none or val is not None
-        ]
-
-        self.do_write(config, **dict(values))
+        self.do_write(
+            config,
+            **{
+                chan: val
+                for val, (chan, _, skip_none) in zip(values, self.channels)
+                if not skip_none or val is not None
+            },
+        )
 
     @staticmethod
     def do_write(config: RunnableConfig, **values: Any) -> None:
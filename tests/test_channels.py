@@ -18,12 +18,14 @@ def test_last_value() -> None:
         assert channel.ValueType is int
         assert channel.UpdateType is int
 
+        assert not channel.is_available()
         with pytest.raises(EmptyChannelError):
             channel.get()
         with pytest.raises(InvalidUpdateError):
             channel.update([5, 6])
 
         channel.update([3])
+        assert channel.is_available()
         assert channel.get() == 3
         channel.update([4])
         assert channel.get() == 4
@@ -37,12 +39,14 @@ async def test_last_value_async() -> None:
         assert channel.ValueType is int
         assert channel.UpdateType is int
 
+        assert not channel.is_available()
         with pytest.raises(EmptyChannelError):
             channel.get()
         with pytest.raises(InvalidUpdateError):
             channel.update([5, 6])
 
         channel.update([3])
+        assert channel.is_available()
         assert channel.get() == 3
         channel.update([4])
         assert channel.get() == 4
@@ -56,6 +60,7 @@ def test_topic() -> None:
         assert channel.ValueType is Sequence[str]
         assert channel.UpdateType is Union[str, list[str]]
 
+        assert channel.is_available()
         channel.update(["a", "b"])
         assert channel.get() == ["a", "b"]
         channel.update([["c", "d"], "d"])
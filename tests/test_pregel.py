@@ -279,6 +279,75 @@ def test_invoke_two_processes_in_out_interrupt(mocker: MockerFixture) -> None:
     assert app.invoke(None, {"configurable": {"thread_id": 1}}) == 5
 
 
+def test_invoke_two_processes_in_out_interrupt_invalid_input(
+    mocker: MockerFixture,
+) -> None:
+    add_one = mocker.Mock(side_effect=lambda x: x + 1)
+    one = Channel.subscribe_to("a") | add_one | Channel.write_to("b")
+    two = Channel.subscribe_to("b") | add_one | Channel.write_to("output")
+
+    memory = MemorySaver()
+    app = Pregel(
+        nodes={"one": one, "two": two},
+        checkpointer=memory,
+        input=["a"],
+        interrupt=["b"],
+    )
+    config = {"configurable": {"thread_id": 1}}
+
+    # start execution, stop at b
+    assert app.invoke({"a": 2}, config) is None
+    checkpoint = memory.get(config)
+    assert checkpoint is not None
+    assert checkpoint["versions_seen"]["two"]["b"] == 0
+
+    # an invalid chunk fails before any pending task is discarded
+    with pytest.raises(TypeError):
+        for _ in app.transform(iter([{"a": 5}, "not-a-dict"]), config):
+            pass
+    checkpoint = memory.get(config)
+    assert checkpoint is not None
+    assert checkpoint["versions_seen"]["two"]["b"] == 0
+
+    # resume execution, finish
+    assert app.invoke(None, config) == 4
+
+
+def test_invoke_two_processes_no_writes_ends_run(mocker: MockerFixture) -> None:
+    add_one = mocker.Mock(side_effect=lambda x: x + 1)
+    one = (
+        Channel.subscribe_to("input") | add_one | Channel.write_to(inbox=lambda _: None)
+    )
+    two = Channel.subscribe_to("inbox") | add_one | Channel.write_to("output")
+
+    app = Pregel(nodes={"one": one, "two": two})
+
+    # step 0 writes nothing, so two is never triggered
+    assert app.invoke(2) is None
+    assert add_one.call_count == 1
+
+
+def test_invoke_two_processes_no_writes_reserved_is_last(
+    mocker: MockerFixture,
+) -> None:
+    add_one = mocker.Mock(side_effect=lambda x: x + 1)
+    one = (
+        Channel.subscribe_to("input") | add_one | Channel.write_to(inbox=lambda _: None)
+    )
+    two = (
+        Channel.subscribe_to(ReservedChannels.is_last_step, when=bool)
+        | RunnablePassthrough()
+        | Channel.write_to(output=lambda _: "last")
+    )
+
+    app = Pregel(nodes={"one": one, "two": two})
+
+    # two is triggered by is_last_step alone, even after a step without writes
+    assert app.invoke(2) is None
+    assert app.invoke(2, {"recursion_limit": 2}) == "last"
+    assert add_one.call_count == 2
+
+
 def test_invoke_two_processes_in_dict_out(mocker: MockerFixture) -> None:
     add_one = mocker.Mock(side_effect=lambda x: x + 1)
     one = Channel.subscribe_to("input") | add_one | Channel.write_to("inbox")
@@ -384,6 +453,23 @@ def test_batch_many_processes_in_out(mocker: MockerFixture) -> None:
         ] * 3
 
 
+def test_invoke_single_process_step_timeout() -> None:
+    def slow(input: int) -> int:
+        time.sleep(0.5)
+        return input
+
+    chain = Channel.subscribe_to("input") | slow | Channel.write_to("output")
+
+    app = Pregel(nodes={"one": chain}, step_timeout=0.05)
+
+    with pytest.raises(TimeoutError):
+        app.invoke(2)
+
+    app = Pregel(nodes={"one": chain})
+
+    assert app.invoke(2) == 2
+
+
 def test_invoke_two_processes_two_in_two_out_invalid(mocker: MockerFixture) -> None:
     add_one = mocker.Mock(side_effect=lambda x: x + 1)
 
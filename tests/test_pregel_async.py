@@ -287,6 +287,79 @@ async def test_invoke_two_processes_in_out_interrupt(mocker: MockerFixture) -> N
     assert await app.ainvoke(None, {"configurable": {"thread_id": 1}}) == 5
 
 
+async def test_invoke_two_processes_in_out_interrupt_invalid_input(
+    mocker: MockerFixture,
+) -> None:
+    add_one = mocker.Mock(side_effect=lambda x: x + 1)
+    one = Channel.subscribe_to("a") | add_one | Channel.write_to("b")
+    two = Channel.subscribe_to("b") | add_one | Channel.write_to("output")
+
+    memory = MemorySaver()
+    app = Pregel(
+        nodes={"one": one, "two": two},
+        checkpointer=memory,
+        input=["a"],
+        interrupt=["b"],
+    )
+    config = {"configurable": {"thread_id": 1}}
+
+    # start execution, stop at b
+    assert await app.ainvoke({"a": 2}, config) is None
+    checkpoint = memory.get(config)
+    assert checkpoint is not None
+    assert checkpoint["versions_seen"]["two"]["b"] == 0
+
+    async def input_stream() -> AsyncIterator[Any]:
+        yield {"a": 5}
+        yield "not-a-dict"
+
+    # an invalid chunk fails before any pending task is discarded
+    with pytest.raises(TypeError):
+        async for _ in app.atransform(input_stream(), config):
+            pass
+    checkpoint = memory.get(config)
+    assert checkpoint is not None
+    assert checkpoint["versions_seen"]["two"]["b"] == 0
+
+    # resume execution, finish
+    assert await app.ainvoke(None, config) == 4
+
+
+async def test_invoke_two_processes_no_writes_ends_run(mocker: MockerFixture) -> None:
+    add_one = mocker.Mock(side_effect=lambda x: x + 1)
+    one = (
+        Channel.subscribe_to("input") | add_one | Channel.write_to(inbox=lambda _: None)
+    )
+    two = Channel.subscribe_to("inbox") | add_one | Channel.write_to("output")
+
+    app = Pregel(nodes={"one": one, "two": two})
+
+    # step 0 writes nothing, so two is never triggered
+    assert await app.ainvoke(2) is None
+    assert add_one.call_count == 1
+
+
+async def test_invoke_two_processes_no_writes_reserved_is_last(
+    mocker: MockerFixture,
+) -> None:
+    add_one = mocker.Mock(side_effect=lambda x: x + 1)
+    one = (
+        Channel.subscribe_to("input") | add_one | Channel.write_to(inbox=lambda _: None)
+    )
+    two = (
+        Channel.subscribe_to(ReservedChannels.is_last_step, when=bool)
+        | RunnablePassthrough()
+        | Channel.write_to(output=lambda _: "last")
+    )
+
+    app = Pregel(nodes={"one": one, "two": two})
+
+    # two is triggered by is_last_step alone, even after a step without writes
+    assert await app.ainvoke(2) is None
+    assert await app.ainvoke(2, {"recursion_limit": 2}) == "last"
+    assert add_one.call_count == 2
+
+
 async def test_invoke_two_processes_in_dict_out(mocker: MockerFixture) -> None:
     add_one = mocker.Mock(side_effect=lambda x: x + 1)
     one = Channel.subscribe_to("input") | add_one | Channel.write_to("inbox")
@@ -412,6 +485,109 @@ async def test_invoke_two_processes_two_in_two_out_invalid(
         await app.ainvoke(2)
 
 
+async def test_invoke_single_process_step_timeout() -> None:
+    async def slow(input: int) -> int:
+        await asyncio.sleep(0.5)
+        return input
+
+    chain = Channel.subscribe_to("input") | slow | Channel.write_to("output")
+
+    app = Pregel(nodes={"one": chain}, step_timeout=0.05)
+
+    with pytest.raises(TimeoutError):
+        await app.ainvoke(2)
+
+    app = Pregel(nodes={"one": chain})
+
+    assert await app.ainvoke(2) == 2
+
+
+async def test_invoke_two_processes_one_fails_cancels_other() -> None:
+    cleaned_up = False
+
+    async def fail(input: int) -> int:
+        await asyncio.sleep(0.01)
+        raise ValueError("fail")
+
+    async def slow(input: int) -> int:
+        nonlocal cleaned_up
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            # cleanup on cancellation takes a few event loop iterations
+            await asyncio.sleep(0.05)
+            cleaned_up = True
+            raise
+        return input
+
+    one = Channel.subscribe_to("input") | fail | Channel.write_to("output")
+    two = Channel.subscribe_to("input") | slow | Channel.write_to("output")
+
+    app = Pregel(nodes={"one": one, "two": two})
+
+    with pytest.raises(ValueError, match="fail"):
+        await app.ainvoke(2)
+
+    # the sibling task was cancelled and finished before the error propagated
+    assert cleaned_up
+
+
+async def test_invoke_two_processes_one_fails_cancels_other_step_timeout() -> None:
+    cleaned_up = False
+
+    async def fail(input: int) -> int:
+        await asyncio.sleep(0.01)
+        raise ValueError("fail")
+
+    async def slow(input: int) -> int:
+        nonlocal cleaned_up
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            # cleanup on cancellation takes a few event loop iterations
+            await asyncio.sleep(0.05)
+            cleaned_up = True
+            raise
+        return input
+
+    one = Channel.subscribe_to("input") | fail | Channel.write_to("output")
+    two = Channel.subscribe_to("input") | slow | Channel.write_to("output")
+
+    app = Pregel(nodes={"one": one, "two": two}, step_timeout=5)
+
+    with pytest.raises(ValueError, match="fail"):
+        await app.ainvoke(2)
+
+    # the sibling task was cancelled and finished before the error propagated
+    assert cleaned_up
+
+
+async def test_invoke_two_processes_one_times_out_cancels_other() -> None:
+    cleaned_up = False
+
+    async def slow(input: int) -> int:
+        nonlocal cleaned_up
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            # cleanup on cancellation takes a few event loop iterations
+            await asyncio.sleep(0.05)
+            cleaned_up = True
+            raise
+        return input
+
+    one = Channel.subscribe_to("input") | slow | Channel.write_to("output")
+    two = Channel.subscribe_to("input") | slow | Channel.write_to("output")
+
+    app = Pregel(nodes={"one": one, "two": two}, step_timeout=0.05)
+
+    with pytest.raises(TimeoutError, match="Timed out at step 0"):
+        await app.ainvoke(2)
+
+    # the timed out tasks were cancelled and finished before the error propagated
+    assert cleaned_up
+
+
 async def test_invoke_two_processes_two_in_two_out_valid(mocker: MockerFixture) -> None:
     add_one = mocker.Mock(side_effect=lambda x: x + 1)
 